@@ -4,53 +4,194 @@ import argparse
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from urllib.parse import urlencode
 
-import requests
+import urllib3
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Call Gemini to produce a summary")
-    parser.add_argument('--input', required=True, help='Path to JSON payload file')
-    args = parser.parse_args()
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
 
-    api_key = os.getenv('GOOGLE_AI_API_KEY')
-    if not api_key:
-        raise SystemExit('GOOGLE_AI_API_KEY environment variable is required')
 
-    data = json.loads(Path(args.input).read_text(encoding='utf-8'))
+def _loads(data):
+    """Parse a JSON document from raw UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _dumps(obj):
+    """Serialize a JSON document to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _first_candidate(response):
+    """Return the first entry of ``candidates`` from a streamed response."""
+    if ijson is not None:
+        # Stop once the first candidate is built; prompt feedback, usage
+        # metadata and any further candidates are never materialized.
+        return next(ijson.items(response, 'candidates.item'), None)
+    try:
+        return _loads(response.read())['candidates'][0]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+class PayloadError(ValueError):
+    """Raised when a summary payload is missing required fields."""
+
+
+_MAX_CONCURRENCY = 8
+_HTTP = urllib3.PoolManager(num_pools=1, maxsize=_MAX_CONCURRENCY)
+
+
+def _post(api_key, data, method, **params):
+    """Send a ``{model, prompt}`` payload to a Gemini model method."""
     model = data.get('model') or 'gemini-1.5-pro-latest'
     prompt = data.get('prompt')
     if not prompt:
-        raise SystemExit('Payload missing "prompt" field')
+        raise PayloadError('Payload missing "prompt" field')
 
-    endpoint = f'https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent'
+    endpoint = f'https://generativelanguage.googleapis.com/v1beta/models/{model}:{method}'
 
-    response = requests.post(
-        endpoint,
-        params={'key': api_key},
-        json={
+    response = _HTTP.request(
+        'POST',
+        f'{endpoint}?{urlencode({"key": api_key, **params})}',
+        body=_dumps({
             'contents': [
                 {
                     'role': 'user',
                     'parts': [{'text': prompt}],
                 }
             ]
-        },
+        }),
+        headers={'Content-Type': 'application/json'},
         timeout=60,
+        preload_content=False,
     )
-    response.raise_for_status()
+    if response.status >= 400:
+        response.drain_conn()
+        response.release_conn()
+        raise RuntimeError(f'Gemini API request failed with HTTP {response.status}')
+    return response
+
 
-    payload = response.json()
-    candidates = payload.get('candidates') or []
-    if not candidates:
+def summarize(api_key, data) -> str:
+    """Request a summary for a single ``{model, prompt}`` payload."""
+    response = _post(api_key, data, 'generateContent')
+    try:
+        candidate = _first_candidate(response)
+    finally:
+        # Discard any unparsed tail so the connection can be reused.
+        response.drain_conn()
+        response.release_conn()
+    if candidate is None:
         raise RuntimeError('No candidates returned by Gemini API')
 
-    parts = candidates[0].get('content', {}).get('parts', [])
-    output = ''.join(part.get('text', '') for part in parts).strip()
+    try:
+        parts = candidate['content']['parts']
+    except KeyError:
+        raise RuntimeError('Gemini response contained no text') from None
+    output = ''.join([part['text'] for part in parts if 'text' in part]).strip()
     if not output:
         raise RuntimeError('Gemini response contained no text')
+    return output
+
+
+def stream_summary(api_key, data, out) -> None:
+    """Write summary text to ``out`` as Gemini streams it back over SSE."""
+    response = _post(api_key, data, 'streamGenerateContent', alt='sse')
+    wrote = False
+    try:
+        for line in response:
+            if not line.startswith(b'data:'):
+                continue
+            try:
+                parts = _loads(line[5:])['candidates'][0]['content']['parts']
+            except (KeyError, IndexError):
+                continue
+            for part in parts:
+                text = part.get('text')
+                if text:
+                    out.write(text)
+                    wrote = True
+            out.flush()
+    finally:
+        response.drain_conn()
+        response.release_conn()
+    if not wrote:
+        raise RuntimeError('Gemini response contained no text')
+    out.write('\n')
+
+
+def _api_key():
+    api_key = os.getenv('GOOGLE_AI_API_KEY')
+    if not api_key:
+        raise RuntimeError('GOOGLE_AI_API_KEY environment variable is required')
+    return api_key
+
+
+def summarize_from_dict(payload, api_key=None):
+    """Summarize an already-parsed payload, or each payload of a list.
+
+    Returns the summary text for a single payload and a list of summaries,
+    in input order, for a list.
+    """
+    if api_key is None:
+        api_key = _api_key()
+    if not isinstance(payload, list):
+        return summarize(api_key, payload)
 
+    # Requests are network-bound, so a small thread pool overlaps them and
+    # total latency follows the slowest call rather than the sum.
+    if not payload:
+        return []
+    workers = min(_MAX_CONCURRENCY, len(payload))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(partial(summarize, api_key), payload))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Call Gemini to produce a summary")
+    parser.add_argument(
+        '--input',
+        required=True,
+        help='Path to JSON payload file (one payload or a list of payloads)',
+    )
+    parser.add_argument(
+        '--streaming',
+        action='store_true',
+        help='Print text as it is generated (single payload only)',
+    )
+    args = parser.parse_args()
+
+    try:
+        api_key = _api_key()
+    except RuntimeError as exc:
+        raise SystemExit(str(exc)) from None
+    data = _loads(Path(args.input).read_bytes())
+    try:
+        if args.streaming:
+            if isinstance(data, list):
+                raise SystemExit('--streaming accepts a single payload, not a list')
+            stream_summary(api_key, data, sys.stdout)
+            return
+        output = summarize_from_dict(data, api_key)
+    except PayloadError as exc:
+        raise SystemExit(str(exc)) from None
+    if isinstance(output, list):
+        output = _dumps(output).decode('utf-8')
     print(output)
 
 
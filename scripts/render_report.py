@@ -1,146 +1,232 @@
 #!/usr/bin/env python3
 """Render finance report into HTML and plain text."""
 import argparse
-import html
 import json
 import sys
-from datetime import datetime
+import time
+from functools import lru_cache
 from pathlib import Path
-from textwrap import indent, wrap
+from textwrap import TextWrapper, indent
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _loads(data):
+    """Parse a JSON document from raw UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+_HTML_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+
+def escape_html(value):
+    # Same output as html.escape(value, quote=True) in one translate pass.
+    return str(value).translate(_HTML_TABLE)
 
 
 def fmt_number(value):
-    if isinstance(value, (int, float)):
-        return f"{value:,}"
+    kind = type(value)
+    if kind is int or kind is float:
+        return format(value, ',')
     return str(value)
 
 
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+@lru_cache(maxsize=4096)
+def _fmt_window_cached(ts):
+    # Equivalent to datetime.fromtimestamp(...).strftime('%b %d %Y %H:%M')
+    # in the default C locale, without building a datetime.
+    tm = time.localtime(ts / 1000)
+    return f"{_MONTHS[tm.tm_mon - 1]} {tm.tm_mday:02d} {tm.tm_year} {tm.tm_hour:02d}:{tm.tm_min:02d}"
+
+
 def fmt_window(ts):
-    if ts is None:
-        return "N/A"
-    dt = datetime.fromtimestamp(ts / 1000)
-    return dt.strftime('%b %d %Y %H:%M')
+    return "N/A" if ts is None else _fmt_window_cached(ts)
+
+
+_BULLET_PREFIXES = ('- ', '* ')
+_DIGIT_DOT = frozenset('.)')
 
 
 def parse_ai_summary(summary):
     if not summary:
-        return [], []
-    lines = [line.strip() for line in summary.splitlines() if line.strip()]
+        return [], [], []
+    # Blank entries are kept so the text renderer can preserve spacing.
+    lines = list(map(str.strip, summary.splitlines()))
     bullets = []
     paragraphs = []
-    for line in lines:
-        if line.startswith(('- ', '* ')):
+    for line in filter(None, lines):
+        if line.startswith(_BULLET_PREFIXES):
             bullets.append(line[2:].strip())
-        elif line[:2].isdigit() and line[2:3] in {'.', ')'}:
+        elif len(line) >= 3 and line[0].isdigit() and line[1].isdigit() and line[2] in _DIGIT_DOT:
             bullets.append(line[3:].strip())
         else:
             paragraphs.append(line)
-    return bullets, paragraphs
+    return bullets, paragraphs, lines
 
 
-def build_overview_html(overview, window_hours):
-    rows = [
-        ('Accounts', fmt_number(overview['accounts'])),
-        ('Total tweets', fmt_number(overview['totalTweets'])),
-        ('Total likes', fmt_number(overview['totalLikes'])),
-        ('Total retweets', fmt_number(overview['totalRetweets'])),
-        ('Total replies', fmt_number(overview['totalReplies'])),
-    ]
-    if overview['earliestStart'] and overview['latestEnd']:
-        rows.append(
-            (
-                'Overall window',
-                f"{fmt_window(overview['earliestStart'])} to {fmt_window(overview['latestEnd'])}"
-            )
-        )
-    table_rows = '\n'.join(
-        f"<tr><th>{html.escape(label)}</th><td>{html.escape(value)}</td></tr>"
-        for label, value in rows
+def _preprocess(payload):
+    """Return a copy of ``payload`` with summaries parsed and tweet fields formatted.
+
+    The caller's dicts are left untouched, so the derived fields never
+    outlive a single render.
+    """
+    _esc = escape_html
+    _fmt = fmt_number
+    _fmt_window = fmt_window
+    accounts = []
+    for account in payload['accounts']:
+        tweets = []
+        for tweet in account['topTweets']:
+            tweets.append({
+                **tweet,
+                '_ts_str': _fmt_window(tweet['timestamp']),
+                '_likes_str': _fmt(tweet['likes']),
+                '_retweets_str': _fmt(tweet['retweets']),
+                '_replies_str': _fmt(tweet['replies']),
+                '_text_html': _esc(tweet['text']),
+                '_url_html': _esc(tweet['url']) if tweet['url'] else '',
+            })
+        accounts.append({
+            **account,
+            '_summary': parse_ai_summary(account['aiSummary']),
+            'topTweets': tweets,
+        })
+    return {**payload, 'accounts': accounts}
+
+
+# Row openers are escaped once here; the cells only ever hold formatted numbers.
+_OVERVIEW_ROWS = tuple(
+    (f"<tr><th>{escape_html(label)}</th><td>", key)
+    for label, key in (
+        ('Accounts', 'accounts'),
+        ('Total tweets', 'totalTweets'),
+        ('Total likes', 'totalLikes'),
+        ('Total retweets', 'totalRetweets'),
+        ('Total replies', 'totalReplies'),
     )
-    return (
-        "<section class=\"card overview\">"
-        "<h2>Run Overview</h2>"
-        f"<p class=\"meta\">Coverage window: last {window_hours} hours</p>"
-        f"<table>{table_rows}</table>"
-        "</section>"
+)
+
+_METRIC_ROWS = tuple(
+    (f"<tr><th>{escape_html(label)}</th><td>", key)
+    for label, key in (
+        ('Total tweets', 'total'),
+        ('Originals', 'originals'),
+        ('Replies', 'replies'),
+        ('Retweets', 'retweets'),
+        ('Likes', 'likes'),
+        ('Retweets (engagement)', 'engagementRetweets'),
+        ('Replies (engagement)', 'engagementReplies'),
     )
+)
 
 
-def build_account_html(account):
-    bullets, paragraphs = parse_ai_summary(account['aiSummary'])
-    summary_parts = []
-    if bullets:
-        summary_parts.append(
-            '<ul>' + ''.join(f"<li>{html.escape(item)}</li>" for item in bullets) + '</ul>'
-        )
-    for paragraph in paragraphs:
-        summary_parts.append(f"<p>{html.escape(paragraph)}</p>")
-    if not summary_parts:
-        summary_parts.append('<p>No highlights available.</p>')
+def build_overview_html(out, overview, window_hours):
+    _fmt_window = fmt_window
+    _write = out.write
+    _write('<section class="card overview"><h2>Run Overview</h2><p class="meta">Coverage window: last ')
+    _write(str(window_hours))
+    _write(' hours</p><table>')
+    for row_start, key in _OVERVIEW_ROWS:
+        _write(row_start)
+        _write(format(overview[key], ',d'))
+        _write('</td></tr>')
+    if overview['earliestStart'] and overview['latestEnd']:
+        _write('<tr><th>Overall window</th><td>')
+        _write(_fmt_window(overview['earliestStart']))
+        _write(' to ')
+        _write(_fmt_window(overview['latestEnd']))
+        _write('</td></tr>')
+    _write('</table></section>')
+
+
+def build_account_html(out, account):
+    _esc = escape_html
+    _fmt_window = fmt_window
+    _write = out.write
+    bullets, paragraphs, _ = account['_summary']
+
+    _write('<section class="card account"><h2>@')
+    _write(_esc(account['username']))
+    _write('</h2><p class="meta">')
+    _write(_fmt_window(account['windowStart']))
+    _write(' to ')
+    _write(_fmt_window(account['windowEnd']))
+    _write('</p><table>')
 
     m = account['metrics']
-    metrics_rows = [
-        ('Total tweets', m['total']),
-        ('Originals', m['originals']),
-        ('Replies', m['replies']),
-        ('Retweets', m['retweets']),
-        ('Likes', m['likes']),
-        ('Retweets (engagement)', m['engagementRetweets']),
-        ('Replies (engagement)', m['engagementReplies']),
-    ]
-    metrics_table = '\n'.join(
-        f"<tr><th>{html.escape(label)}</th><td>{fmt_number(value)}</td></tr>"
-        for label, value in metrics_rows
-    )
+    for row_start, key in _METRIC_ROWS:
+        _write(row_start)
+        _write(format(m[key], ',d'))
+        _write('</td></tr>')
+    _write('</table><div class="section-block"><h3>AI Highlights</h3>')
+
+    if bullets:
+        _write('<ul>')
+        for item in bullets:
+            _write('<li>')
+            _write(_esc(item))
+            _write('</li>')
+        _write('</ul>')
+    for paragraph in paragraphs:
+        _write('<p>')
+        _write(_esc(paragraph))
+        _write('</p>')
+    if not bullets and not paragraphs:
+        _write('<p>No highlights available.</p>')
+    _write('</div><div class="section-block"><h3>Top Tweets</h3>')
 
     if account['topTweets']:
-        top_tweets_html = '<ol class="tweet-list">' + ''.join(
-            (
-                '<li>'
-                f"<div class=\"tweet-meta\">{html.escape(fmt_window(tweet['timestamp']))}</div>"
-                f"<div class=\"tweet-text\">{html.escape(tweet['text'])}</div>"
-                f"<div class=\"tweet-engagement\">likes {fmt_number(tweet['likes'])} &middot; "
-                f"retweets {fmt_number(tweet['retweets'])} &middot; "
-                f"replies {fmt_number(tweet['replies'])}</div>"
-                + (
-                    f"<div class=\"tweet-link\"><a href=\"{html.escape(tweet['url'])}\">Open</a></div>"
-                    if tweet['url'] else ''
-                )
-                + '</li>'
-            )
-            for tweet in account['topTweets']
-        ) + '</ol>'
+        # Collect the list locally and hand the stream one string.
+        pieces = ['<ol class="tweet-list">']
+        _append = pieces.append
+        for tweet in account['topTweets']:
+            _append('<li><div class="tweet-meta">')
+            _append(tweet['_ts_str'])
+            _append('</div><div class="tweet-text">')
+            _append(tweet['_text_html'])
+            _append('</div><div class="tweet-engagement">likes ')
+            _append(tweet['_likes_str'])
+            _append(' &middot; retweets ')
+            _append(tweet['_retweets_str'])
+            _append(' &middot; replies ')
+            _append(tweet['_replies_str'])
+            _append('</div>')
+            if tweet['url']:
+                _append('<div class="tweet-link"><a href="')
+                _append(tweet['_url_html'])
+                _append('">Open</a></div>')
+            _append('</li>')
+        _append('</ol>')
+        _write(''.join(pieces))
     else:
-        top_tweets_html = '<p class="empty">No top tweets in this window.</p>'
-
-    return (
-        "<section class=\"card account\">"
-        f"<h2>@{html.escape(account['username'])}</h2>"
-        f"<p class=\"meta\">{fmt_window(account['windowStart'])} to {fmt_window(account['windowEnd'])}</p>"
-        f"<table>{metrics_table}</table>"
-        '<div class="section-block">'
-        '<h3>AI Highlights</h3>'
-        + ''.join(summary_parts)
-        + '</div>'
-        '<div class="section-block">'
-        '<h3>Top Tweets</h3>'
-        + top_tweets_html
-        + '</div>'
-        '</section>'
-    )
+        _write('<p class="empty">No top tweets in this window.</p>')
+    _write('</div></section>')
 
 
-def render_html(payload):
-    overview_html = build_overview_html(payload['overview'], payload['windowHours'])
-    accounts_html = '\n'.join(build_account_html(acc) for acc in payload['accounts'])
+# Output files are written through a 64 KiB buffer while rendering.
+_WRITE_BUFFER_SIZE = 1 << 16
 
-    return f"""<!DOCTYPE html>
-<html lang=\"en\">
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
 <head>
-<meta charset=\"utf-8\" />
+<meta charset="utf-8" />
 <title>Finance Twitter Report</title>
 <style>
-  :root {{
+  :root {
     color-scheme: light dark;
     font-family: 'Segoe UI', Tahoma, Arial, sans-serif;
     --bg: #f8fafc;
@@ -149,168 +235,195 @@ def render_html(payload):
     --muted: #6b7280;
     --accent: #2563eb;
     --border: #e5e7eb;
-  }}
-  body {{
+  }
+  body {
     margin: 0;
     background: var(--bg);
     color: var(--text);
-  }}
-  .container {{
+  }
+  .container {
     max-width: 900px;
     margin: 0 auto;
     padding: 32px 20px 48px;
-  }}
-  h1 {{
+  }
+  h1 {
     font-size: 28px;
     margin-bottom: 12px;
-  }}
-  .card {{
+  }
+  .card {
     background: var(--card-bg);
     border: 1px solid var(--border);
     border-radius: 16px;
     padding: 20px;
     margin-bottom: 24px;
     box-shadow: 0 12px 28px rgba(15, 23, 42, 0.08);
-  }}
-  .card h2 {{
+  }
+  .card h2 {
     margin-top: 0;
     margin-bottom: 8px;
     font-size: 22px;
-  }}
-  .meta {{
+  }
+  .meta {
     color: var(--muted);
     font-size: 14px;
     margin-top: 0;
     margin-bottom: 16px;
-  }}
-  table {{
+  }
+  table {
     width: 100%;
     border-collapse: collapse;
     margin-bottom: 18px;
-  }}
-  th {{
+  }
+  th {
     text-align: left;
     font-weight: 600;
     padding: 6px 0;
     color: var(--muted);
     width: 45%;
-  }}
-  td {{
+  }
+  td {
     padding: 6px 0;
-  }}
-  ul {{
+  }
+  ul {
     padding-left: 20px;
-  }}
-  .section-block {{
+  }
+  .section-block {
     margin-top: 16px;
-  }}
-  .section-block h3 {{
+  }
+  .section-block h3 {
     margin-bottom: 8px;
     font-size: 18px;
-  }}
-  .tweet-list {{
+  }
+  .tweet-list {
     padding-left: 18px;
-  }}
-  .tweet-list li {{
+  }
+  .tweet-list li {
     margin-bottom: 14px;
-  }}
-  .tweet-meta {{
+  }
+  .tweet-meta {
     font-size: 13px;
     color: var(--muted);
-  }}
-  .tweet-text {{
+  }
+  .tweet-text {
     margin: 4px 0;
-  }}
-  .tweet-engagement {{
+  }
+  .tweet-engagement {
     font-size: 13px;
     color: var(--muted);
-  }}
-  .tweet-link a {{
+  }
+  .tweet-link a {
     color: var(--accent);
     text-decoration: none;
-  }}
-  .tweet-link a:hover {{
+  }
+  .tweet-link a:hover {
     text-decoration: underline;
-  }}
-  .empty {{
+  }
+  .empty {
     color: var(--muted);
-  }}
+  }
 </style>
 </head>
 <body>
-  <div class=\"container\">
+  <div class="container">
     <h1>Finance Twitter Report</h1>
-    {overview_html}
-    {accounts_html}
-  </div>
+"""
+
+_HTML_TAIL = """  </div>
 </body>
 </html>"""
 
 
-def render_text(payload):
-    lines = [
-        f"Finance Twitter report covering the last {payload['windowHours']} hours",
-        ''
-    ]
+def render_html(payload, out):
+    _write_html(_preprocess(payload), out)
+
+
+def _write_html(payload, out):
+    out.write(_HTML_HEAD)
+    build_overview_html(out, payload['overview'], payload['windowHours'])
+    for account in payload['accounts']:
+        build_account_html(out, account)
+    out.write(_HTML_TAIL)
+
+
+_WRAPPER = TextWrapper(width=90)
+
+# Fixed blocks of the text report, filled with one format call each.
+_TEXT_OVERVIEW = (
+    "Finance Twitter report covering the last {window_hours} hours\n\n"
+    "=== Run Overview ===\n"
+    "Accounts: {o[accounts]}\n"
+    "Total tweets: {o[totalTweets]}\n"
+    "Engagement totals - likes: {o[totalLikes]:,}, retweets: {o[totalRetweets]:,},"
+    " replies: {o[totalReplies]:,}\n"
+)
+_TEXT_ACCOUNT = (
+    "\n=== @{username} ===\n"
+    "Window: {window_start} to {window_end}\n"
+    "Tweets collected: {m[total]} (originals: {m[originals]}, replies: {m[replies]},"
+    " retweets: {m[retweets]})\n"
+    "Engagement totals - likes: {likes}, retweets: {retweets}, replies: {replies}\n"
+    "AI Highlights:\n"
+)
+_TEXT_TWEET = (
+    "  {idx}. [{t[_ts_str]}] {t[text]}\n"
+    "    likes {t[_likes_str]} | retweets {t[_retweets_str]} | replies {t[_replies_str]}\n"
+)
+
+
+def render_text(payload, out):
+    _write_text(_preprocess(payload), out)
+
+
+def _write_text(payload, out):
+    _write = out.write
+    _fmt = fmt_number
+    _fmt_window = fmt_window
     overview = payload['overview']
-    lines.append('=== Run Overview ===')
-    lines.append(f"Accounts: {overview['accounts']}")
-    lines.append(f"Total tweets: {overview['totalTweets']}")
-    lines.append(
-        "Engagement totals - likes: "
-        f"{overview['totalLikes']:,}, retweets: {overview['totalRetweets']:,},"
-        f" replies: {overview['totalReplies']:,}"
-    )
+    _write(_TEXT_OVERVIEW.format(window_hours=payload['windowHours'], o=overview))
     if overview['earliestStart'] and overview['latestEnd']:
-        lines.append(
-            f"Overall window: {fmt_window(overview['earliestStart'])} to "
-            f"{fmt_window(overview['latestEnd'])}"
+        _write(
+            f"Overall window: {_fmt_window(overview['earliestStart'])} to "
+            f"{_fmt_window(overview['latestEnd'])}\n"
         )
-    lines.append('')
 
     for account in payload['accounts']:
-        lines.append(f"=== @{account['username']} ===")
-        lines.append(
-            f"Window: {fmt_window(account['windowStart'])} to {fmt_window(account['windowEnd'])}"
-        )
+        # The template opens with the blank line separating sections.
         m = account['metrics']
-        lines.append(
-            "Tweets collected: {} (originals: {}, replies: {}, retweets: {})".format(
-                m['total'], m['originals'], m['replies'], m['retweets']
-            )
-        )
-        lines.append(
-            "Engagement totals - likes: {}, retweets: {}, replies: {}".format(
-                fmt_number(m['likes']), fmt_number(m['engagementRetweets']), fmt_number(m['engagementReplies'])
-            )
-        )
-        lines.append('AI Highlights:')
-        summary_lines = account['aiSummary'].splitlines() if account['aiSummary'] else []
+        _write(_TEXT_ACCOUNT.format(
+            username=account['username'],
+            window_start=_fmt_window(account['windowStart']),
+            window_end=_fmt_window(account['windowEnd']),
+            m=m,
+            likes=_fmt(m['likes']),
+            retweets=_fmt(m['engagementRetweets']),
+            replies=_fmt(m['engagementReplies']),
+        ))
+        summary_lines = account['_summary'][2]
         if summary_lines:
             for item in summary_lines:
-                wrapped = wrap(item.strip(), width=90)
-                lines.append(indent('\n'.join(wrapped) or item, '  '))
+                _write(indent('\n'.join(_WRAPPER.wrap(item)), '  '))
+                _write('\n')
         else:
-            lines.append('  No highlights available.')
+            _write('  No highlights available.\n')
 
         if account['topTweets']:
-            lines.append('Top tweets:')
+            _write('Top tweets:\n')
             for idx, tweet in enumerate(account['topTweets'], 1):
-                header = f"  {idx}. [{fmt_window(tweet['timestamp'])}] {tweet['text']}"
-                lines.append(header)
-                engagement = (
-                    "    likes {} | retweets {} | replies {}".format(
-                        fmt_number(tweet['likes']), fmt_number(tweet['retweets']), fmt_number(tweet['replies'])
-                    )
-                )
-                lines.append(engagement)
+                _write(_TEXT_TWEET.format(idx=idx, t=tweet))
                 if tweet['url']:
-                    lines.append(f"    link: {tweet['url']}")
+                    _write(f"    link: {tweet['url']}\n")
         else:
-            lines.append('Top tweets: none in this window.')
-        lines.append('')
+            _write('Top tweets: none in this window.\n')
+
 
-    return '\n'.join(lines).strip() + '\n'
+def render_from_dict(payload, html_path, text_path):
+    """Write both report outputs for an already-parsed payload."""
+    report = _preprocess(payload)
+    with open(html_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as fh:
+        _write_html(report, fh)
+    with open(text_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as fh:
+        _write_text(report, fh)
+    _fmt_window_cached.cache_clear()
 
 
 def main():
@@ -320,12 +433,8 @@ def main():
     parser.add_argument('--text-output', required=True, help='Destination text file.')
     args = parser.parse_args()
 
-    payload = json.loads(Path(args.input).read_text(encoding='utf-8'))
-    html_output = render_html(payload)
-    text_output = render_text(payload)
-
-    Path(args.html_output).write_text(html_output, encoding='utf-8')
-    Path(args.text_output).write_text(text_output, encoding='utf-8')
+    payload = _loads(Path(args.input).read_bytes())
+    render_from_dict(payload, args.html_output, args.text_output)
 
 
 if __name__ == '__main__':
@@ -333,4 +442,4 @@ if __name__ == '__main__':
         main()
     except Exception as exc:
         print(f'Report renderer failed: {exc}', file=sys.stderr)
-        sys.exit(1)
+        sys.exit(1)